@@ -0,0 +1,162 @@
+# coding:utf-8
+import argparse
+import gzip
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+
+BACKUP_SUFFIX = '.db.gz'
+TEMP_PREFIX = 'tmp'
+# 数据库的日志文件，恢复时必须与主文件一起移走，否则 sqlite 会把旧日志回放到恢复后的文件上
+SIDECAR_SUFFIXES = ('-journal', '-wal', '-shm')
+# 临时文件超过这么久没有写入才视为中断的备份留下的，进行中的备份(可能来自另一个进程)会持续写入
+LEFTOVER_AGE = 60 * 60  # 秒
+
+
+class BackupManager:
+    """ 在线备份 supply_progress.db: 后台线程分页调用 sqlite3 的 backup 接口，压缩后轮换保留 """
+
+    def __init__(self, db_name='supply_progress.db', backup_dir='backups', keep=7, pages=64, sleep=0.01):
+        self.db_name = db_name
+        self.backup_dir = backup_dir
+        self.keep = keep
+        self.pages = pages  # 每一步复制的页数，步与步之间释放读锁，写入方不会被长时间阻塞
+        self.sleep = sleep
+        self.thread = None
+        self.last_error = None
+
+    def snapshot_prefix(self):
+        return os.path.splitext(os.path.basename(self.db_name))[0] + '-'
+
+    def list_snapshots(self):
+        """ 按时间从新到旧返回快照路径 """
+        if not os.path.isdir(self.backup_dir):
+            return []
+        prefix = self.snapshot_prefix()
+        names = [name for name in os.listdir(self.backup_dir)
+                 if name.startswith(prefix) and name.endswith(BACKUP_SUFFIX)]
+        return [os.path.join(self.backup_dir, name) for name in sorted(names, reverse=True)]
+
+    def is_backup_due(self, interval):
+        snapshots = self.list_snapshots()
+        return not snapshots or time.time() - os.path.getmtime(snapshots[0]) >= interval
+
+    def is_running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start_backup(self):
+        """ 在后台线程中执行一次备份，已有备份在进行时直接返回 False """
+        if self.is_running():
+            return False
+        self.thread = threading.Thread(target=self.run_backup, name='db-backup', daemon=True)
+        self.thread.start()
+        return True
+
+    def run_backup(self):
+        try:
+            return self.backup()
+        except (sqlite3.Error, OSError) as e:
+            self.last_error = e
+            print(f"Error backing up database: {e}")
+
+    def backup(self):
+        os.makedirs(self.backup_dir, exist_ok=True)
+        self.remove_leftovers()
+        snapshot = os.path.join(self.backup_dir,
+                                self.snapshot_prefix() + time.strftime('%Y%m%d-%H%M%S') + BACKUP_SUFFIX)
+
+        fd, temp_path = tempfile.mkstemp(suffix='.db', prefix=TEMP_PREFIX, dir=self.backup_dir)
+        os.close(fd)
+        try:
+            # 备份线程使用独立连接，sqlite3 连接不能跨线程共享
+            source = sqlite3.connect(self.db_name)
+            target = sqlite3.connect(temp_path)
+            try:
+                source.backup(target, pages=self.pages, sleep=self.sleep)
+            finally:
+                target.close()
+                source.close()
+
+            with open(temp_path, 'rb') as f_in, gzip.open(snapshot + '.part', 'wb') as f_out:
+                shutil.copyfileobj(f_in, f_out)
+            os.replace(snapshot + '.part', snapshot)
+        finally:
+            os.remove(temp_path)
+
+        self.rotate()
+        return snapshot
+
+    def remove_leftovers(self):
+        """ 删除上次备份中断(进程被结束、断电)时留下的临时文件，最近仍在写入的文件属于正在进行的备份，保留不动 """
+        now = time.time()
+        for name in os.listdir(self.backup_dir):
+            if (name.startswith(TEMP_PREFIX) and name.endswith('.db')) or name.endswith(BACKUP_SUFFIX + '.part'):
+                path = os.path.join(self.backup_dir, name)
+                try:
+                    if now - os.path.getmtime(path) >= LEFTOVER_AGE:
+                        os.remove(path)
+                except OSError:
+                    # 文件刚被另一个备份删除或正被占用
+                    pass
+
+    def rotate(self):
+        for snapshot in self.list_snapshots()[self.keep:]:
+            os.remove(snapshot)
+
+    def extract_snapshot(self, snapshot):
+        """ 解压快照到临时文件并做完整性检查，失败时抛出 sqlite3.DatabaseError """
+        fd, temp_path = tempfile.mkstemp(suffix='.db', dir=os.path.dirname(os.path.abspath(self.db_name)))
+        os.close(fd)
+        try:
+            with gzip.open(snapshot, 'rb') as f_in, open(temp_path, 'wb') as f_out:
+                shutil.copyfileobj(f_in, f_out)
+            conn = sqlite3.connect(temp_path)
+            try:
+                result = conn.execute('PRAGMA integrity_check').fetchone()[0]
+            finally:
+                conn.close()
+            if result != 'ok':
+                raise sqlite3.DatabaseError(f'snapshot {snapshot} failed integrity check: {result}')
+        except (OSError, sqlite3.Error):
+            os.remove(temp_path)
+            raise
+        return temp_path
+
+    def restore(self, snapshot):
+        """ 离线恢复: 校验通过后替换数据库文件，原文件及其日志文件保留为 .before-restore """
+        temp_path = self.extract_snapshot(snapshot)
+        if os.path.exists(self.db_name):
+            shutil.copy2(self.db_name, self.db_name + '.before-restore')
+        for suffix in SIDECAR_SUFFIXES:
+            if os.path.exists(self.db_name + suffix):
+                os.replace(self.db_name + suffix, self.db_name + '.before-restore' + suffix)
+        os.replace(temp_path, self.db_name)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='supply_progress.db 备份与恢复')
+    parser.add_argument('--db', default='supply_progress.db')
+    parser.add_argument('--dir', default='backups')
+    parser.add_argument('--keep', type=int, default=7)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('backup', help='立即备份一次')
+    subparsers.add_parser('list', help='列出已有快照')
+    restore_parser = subparsers.add_parser('restore', help='从快照恢复(请先关闭软件)')
+    restore_parser.add_argument('snapshot', nargs='?', help='快照路径，默认使用最新快照')
+    args = parser.parse_args()
+
+    manager = BackupManager(args.db, args.dir, keep=args.keep)
+    if args.command == 'backup':
+        print(manager.backup())
+    elif args.command == 'list':
+        for path in manager.list_snapshots():
+            print(path)
+    else:
+        snapshot = args.snapshot or next(iter(manager.list_snapshots()), None)
+        if snapshot is None:
+            parser.error('no snapshot found')
+        manager.restore(snapshot)
+        print(f'restored {args.db} from {snapshot}')
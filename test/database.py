@@ -1,14 +1,177 @@
+import bisect
 import sqlite3
+from collections import OrderedDict
+from functools import wraps
+
 from PyQt5.QtCore import QDate
 
+DATE_FORMAT = 'yyyy-MM-dd'
+
+
+def date_to_day(date_str):
+    """ Convert a 'yyyy-MM-dd' string to a julian day number, None if empty or invalid """
+    if not date_str:
+        return None
+    date = QDate.fromString(date_str, DATE_FORMAT)
+    return date.toJulianDay() if date.isValid() else None
+
+
+def part_lateness(planned_day, actual_day):
+    """ 零件实际交货比计划晚的天数，提前为负数，未交货为 None """
+    if planned_day is None or actual_day is None:
+        return None
+    return actual_day - planned_day
+
+
+def day_to_date(day):
+    """ Convert a julian day number back to a 'yyyy-MM-dd' string """
+    if day is None:
+        return ''
+    return QDate.fromJulianDay(day).toString(DATE_FORMAT)
+
+
+class Order:
+    """ orders 表中的一行，缓存结果在调用方之间共享，请勿修改 """
+    __slots__ = ('order_id', 'order_name', 'customer_name', 'delivery_date', 'salesperson', 'order_amount')
+
+    def __init__(self, order_id, order_name, customer_name, delivery_date, salesperson, order_amount):
+        self.order_id = order_id
+        self.order_name = order_name
+        self.customer_name = customer_name
+        self.delivery_date = delivery_date
+        self.salesperson = salesperson
+        self.order_amount = order_amount
+
+
+class OrderPart:
+    """ order_parts 表中的一行，值保持数据库中的原始类型(未填写为 None)，只在显示时转换；缓存结果在调用方之间共享，请勿修改 """
+    __slots__ = ('part_id', 'order_id', 'part_name', 'supplier', 'planned_delivery_date', 'actual_delivery_date',
+                 'delivery_status', 'delivery_deviation', 'planned_delivery_day', 'actual_delivery_day')
+
+    def __init__(self, part_id, order_id, part_name, supplier, planned_delivery_date, actual_delivery_date,
+                 delivery_status, delivery_deviation, planned_delivery_day, actual_delivery_day):
+        self.part_id = part_id
+        self.order_id = order_id
+        self.part_name = part_name
+        self.supplier = supplier
+        self.planned_delivery_date = planned_delivery_date
+        self.actual_delivery_date = actual_delivery_date
+        self.delivery_status = delivery_status
+        self.delivery_deviation = delivery_deviation
+        self.planned_delivery_day = planned_delivery_day
+        self.actual_delivery_day = actual_delivery_day
+
+
+class InternTable:
+    """ 字典编码维度表(供应商、交货情况)的内存缓存: 名称 <-> 整数 id，同一名称在内存中只保留一份字符串 """
+    __slots__ = ('table', 'id_column', 'name_column', 'ids', 'names')
+
+    def __init__(self, table, id_column, name_column):
+        self.table = table
+        self.id_column = id_column
+        self.name_column = name_column
+        self.ids = {}  # 名称 -> id
+        self.names = {}  # id -> 名称
+
+    def load(self, cursor):
+        cursor.execute(f'SELECT {self.id_column}, {self.name_column} FROM {self.table}')
+        for value_id, name in cursor.fetchall():
+            self.ids[name] = value_id
+            self.names[value_id] = name
+
+    def intern(self, cursor, name):
+        """ 返回名称对应的 id，表中没有时插入新行 """
+        value_id = self.ids.get(name)
+        if value_id is None:
+            cursor.execute(f'INSERT INTO {self.table} ({self.name_column}) VALUES (?)', (name,))
+            value_id = cursor.lastrowid
+            self.ids[name] = value_id
+            self.names[value_id] = name
+        return value_id
+
+    def name(self, value_id):
+        return self.names.get(value_id, '')
+
+
+# 常用语句保持固定的 SQL 文本，sqlite3 连接本身按文本缓存已编译的语句(默认 128 条)，这里只是调大了缓存条数
+FETCH_ORDERS_SQL = ('SELECT order_id, order_name, customer_name, delivery_date, salesperson, order_amount '
+                    'FROM orders')
+FETCH_ORDER_PARTS_SQL = ('SELECT part_id, order_id, part_name, supplier_id, planned_delivery_date, actual_delivery_date, '
+                         'status_id, delivery_deviation, planned_delivery_day, actual_delivery_day '
+                         'FROM order_parts WHERE order_id = ?')
+
+
+# 供应商和交货情况以整数 id 引用 suppliers / statuses 表
+CREATE_ORDER_PARTS_TABLE = '''CREATE TABLE IF NOT EXISTS {table} (
+                                part_id INTEGER PRIMARY KEY,
+                                order_id INTEGER NOT NULL,
+                                part_name TEXT NOT NULL,
+                                supplier_id INTEGER NOT NULL,
+                                planned_delivery_date DATE NOT NULL,
+                                actual_delivery_date DATE,
+                                status_id INTEGER NOT NULL,
+                                delivery_deviation REAL,
+                                planned_delivery_day INTEGER,
+                                actual_delivery_day INTEGER,
+                                FOREIGN KEY(order_id) REFERENCES orders(order_id),
+                                FOREIGN KEY(supplier_id) REFERENCES suppliers(supplier_id),
+                                FOREIGN KEY(status_id) REFERENCES statuses(status_id))'''
+
+
+def cached_read(*tables):
+    """ 读方法结果缓存，每个(方法, 参数)只保留一条，命中时比较所依赖表的版本号，过期的结果直接被新结果替换 """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args):
+            key = (method.__name__, args)
+            generations = tuple(self.table_generations[table] for table in tables)
+            entry = self.read_cache.get(key)
+            if entry is not None and entry[0] == generations:
+                self.read_cache.move_to_end(key)
+                self.cache_hits += 1
+                return entry[1]
+            self.cache_misses += 1
+            result = method(self, *args)
+            self.read_cache[key] = (generations, result)
+            self.read_cache.move_to_end(key)
+            if len(self.read_cache) > self.READ_CACHE_SIZE:
+                self.read_cache.popitem(last=False)
+            return result
+        return wrapper
+    return decorator
+
+
+def bumps(*tables):
+    """ 写方法执行后递增所写表的版本号 """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                for table in tables:
+                    self.table_generations[table] += 1
+        return wrapper
+    return decorator
+
+
 class Database:
     _instance = None
+    READ_CACHE_SIZE = 128
+    STATEMENT_CACHE_SIZE = 256
 
     def __new__(cls, db_name='supply_progress.db'):
         if cls._instance is None:
             cls._instance = super(Database, cls).__new__(cls)
-            cls._instance.conn = sqlite3.connect(db_name)
+            cls._instance.db_name = db_name
+            cls._instance.conn = sqlite3.connect(db_name, cached_statements=cls.STATEMENT_CACHE_SIZE)
             cls._instance.c = cls._instance.conn.cursor()
+            cls._instance.read_cache = OrderedDict()
+            cls._instance.table_generations = {'orders': 0, 'order_parts': 0, 'overdue_parts': 0, 'order_impact': 0}
+            cls._instance.cache_hits = 0
+            cls._instance.cache_misses = 0
+            cls._instance.suppliers = InternTable('suppliers', 'supplier_id', 'supplier_name')
+            cls._instance.statuses = InternTable('statuses', 'status_id', 'status_name')
             cls._instance.initialize_database()
         return cls._instance
 
@@ -22,6 +185,12 @@ class Database:
     def initialize_database(self):
         self.create_tables()
         self.add_amount_column_if_not_exists()
+        self.normalize_part_dimensions_if_needed()
+        self.add_day_columns_if_not_exists()
+        self.create_overdue_tables()
+        self.create_order_impact_table()
+        self.suppliers.load(self.c)
+        self.statuses.load(self.c)
 
     def create_tables(self):
         CREATE_ORDERS_TABLE = '''CREATE TABLE IF NOT EXISTS orders (
@@ -31,19 +200,17 @@ class Database:
                                     delivery_date DATE NOT NULL,
                                     salesperson TEXT NOT NULL,
                                     order_amount REAL)'''  # Added order_amount column
-        CREATE_ORDER_PARTS_TABLE = '''CREATE TABLE IF NOT EXISTS order_parts (
-                                        part_id INTEGER PRIMARY KEY,
-                                        order_id INTEGER NOT NULL,
-                                        part_name TEXT NOT NULL,
-                                        supplier TEXT NOT NULL,
-                                        planned_delivery_date DATE NOT NULL,
-                                        actual_delivery_date DATE,
-                                        delivery_status TEXT NOT NULL,
-                                        delivery_deviation REAL,
-                                        FOREIGN KEY(order_id) REFERENCES orders(order_id))'''
+        CREATE_SUPPLIERS_TABLE = '''CREATE TABLE IF NOT EXISTS suppliers (
+                                    supplier_id INTEGER PRIMARY KEY,
+                                    supplier_name TEXT NOT NULL UNIQUE)'''
+        CREATE_STATUSES_TABLE = '''CREATE TABLE IF NOT EXISTS statuses (
+                                    status_id INTEGER PRIMARY KEY,
+                                    status_name TEXT NOT NULL UNIQUE)'''
 
         self.c.execute(CREATE_ORDERS_TABLE)
-        self.c.execute(CREATE_ORDER_PARTS_TABLE)
+        self.c.execute(CREATE_SUPPLIERS_TABLE)
+        self.c.execute(CREATE_STATUSES_TABLE)
+        self.c.execute(CREATE_ORDER_PARTS_TABLE.format(table='order_parts'))
         self.conn.commit()
 
     def add_amount_column_if_not_exists(self):
@@ -54,95 +221,377 @@ class Database:
             # Column already exists, ignore the error
             pass
 
+    def normalize_part_dimensions_if_needed(self):
+        # 旧版本的 order_parts 直接保存供应商和交货情况文本，迁移为引用维度表的整数 id
+        self.c.execute('PRAGMA table_info(order_parts)')
+        if 'supplier' not in [column[1] for column in self.c.fetchall()]:
+            return
+
+        self.c.execute('INSERT OR IGNORE INTO suppliers (supplier_name) SELECT DISTINCT supplier FROM order_parts')
+        self.c.execute('INSERT OR IGNORE INTO statuses (status_name) SELECT DISTINCT delivery_status FROM order_parts')
+        self.c.execute('DROP TABLE IF EXISTS order_parts_new')
+        self.c.execute(CREATE_ORDER_PARTS_TABLE.format(table='order_parts_new'))
+        # 日期整数列由 add_day_columns_if_not_exists 重新回填，索引也在之后重建
+        self.c.execute('''INSERT INTO order_parts_new (part_id, order_id, part_name, supplier_id, planned_delivery_date,
+                                                       actual_delivery_date, status_id, delivery_deviation)
+                          SELECT order_parts.part_id, order_parts.order_id, order_parts.part_name,
+                                 suppliers.supplier_id, order_parts.planned_delivery_date,
+                                 order_parts.actual_delivery_date, statuses.status_id, order_parts.delivery_deviation
+                          FROM order_parts
+                          JOIN suppliers ON suppliers.supplier_name = order_parts.supplier
+                          JOIN statuses ON statuses.status_name = order_parts.delivery_status''')
+        self.c.execute('DROP TABLE order_parts')
+        self.c.execute('ALTER TABLE order_parts_new RENAME TO order_parts')
+        self.conn.commit()
+        # 释放旧表占用的页，缩小数据库文件
+        self.c.execute('VACUUM')
+
+    def add_day_columns_if_not_exists(self):
+        # 日期同时以 julian day 整数存储，偏差和日期范围查询直接在索引上做整数运算
+        for column in ('planned_delivery_day', 'actual_delivery_day'):
+            try:
+                self.c.execute(f'ALTER TABLE order_parts ADD COLUMN {column} INTEGER')
+            except sqlite3.OperationalError:
+                # Column already exists, ignore the error
+                pass
+        # julianday() 返回当天零点(x.5)，+0.5 取整后与 QDate.toJulianDay() 一致
+        self.c.execute('''UPDATE order_parts
+                          SET planned_delivery_day = CAST(julianday(planned_delivery_date) + 0.5 AS INTEGER)
+                          WHERE planned_delivery_day IS NULL
+                            AND planned_delivery_date != '' AND planned_delivery_date IS NOT NULL''')
+        self.c.execute('''UPDATE order_parts
+                          SET actual_delivery_day = CAST(julianday(actual_delivery_date) + 0.5 AS INTEGER)
+                          WHERE actual_delivery_day IS NULL
+                            AND actual_delivery_date != '' AND actual_delivery_date IS NOT NULL''')
+        self.c.execute('CREATE INDEX IF NOT EXISTS idx_order_parts_planned_day ON order_parts(planned_delivery_day)')
+        self.c.execute('CREATE INDEX IF NOT EXISTS idx_order_parts_actual_day ON order_parts(actual_delivery_day)')
+        self.conn.commit()
+
+    def create_overdue_tables(self):
+        # 部分索引只包含未交货零件，按计划交期排序，逾期扫描只需在其上做范围查询
+        self.c.execute('''CREATE INDEX IF NOT EXISTS idx_order_parts_undelivered
+                          ON order_parts(planned_delivery_day) WHERE actual_delivery_day IS NULL''')
+        self.c.execute('''CREATE TABLE IF NOT EXISTS overdue_parts (
+                            part_id INTEGER PRIMARY KEY,
+                            order_id INTEGER NOT NULL,
+                            planned_delivery_day INTEGER NOT NULL)''')
+        self.c.execute('''CREATE TABLE IF NOT EXISTS sweep_state (
+                            name TEXT PRIMARY KEY,
+                            last_day INTEGER NOT NULL)''')
+        self.conn.commit()
+
+    def create_order_impact_table(self):
+        # 每个订单的零件最大延期天数，零件变更时只增量更新所属订单
+        self.c.execute('CREATE INDEX IF NOT EXISTS idx_order_parts_order ON order_parts(order_id)')
+        self.c.execute('''CREATE TABLE IF NOT EXISTS order_impact (
+                            order_id INTEGER PRIMARY KEY,
+                            max_lateness INTEGER)''')
+        self.c.execute('''INSERT INTO order_impact (order_id, max_lateness)
+                          SELECT orders.order_id, MAX(order_parts.actual_delivery_day - order_parts.planned_delivery_day)
+                          FROM orders
+                          LEFT JOIN order_parts ON orders.order_id = order_parts.order_id
+                          WHERE orders.order_id NOT IN (SELECT order_id FROM order_impact)
+                          GROUP BY orders.order_id''')
+        self.conn.commit()
+
+    def cache_stats(self):
+        return {'hits': self.cache_hits, 'misses': self.cache_misses, 'size': len(self.read_cache),
+                'max_size': self.READ_CACHE_SIZE}
+
+    def clear_cache(self):
+        self.read_cache.clear()
+
+    @cached_read('orders')
     def fetch_order_names(self):
-        self.c.execute('SELECT order_id, order_name FROM orders')
-        orders = self.c.fetchall()
-        return {order_id: order_name for order_id, order_name in orders}
+        return {order.order_id: order.order_name for order in self.fetch_orders()}
+
+    @cached_read('orders')
+    def fetch_orders(self):
+        self.c.execute(FETCH_ORDERS_SQL)
+        return [Order(*row) for row in self.c.fetchall()]
 
+    @cached_read('order_parts')
     def fetch_order_parts(self, order_id):
-        self.c.execute(
-            'SELECT part_id, part_name, supplier, planned_delivery_date, actual_delivery_date, delivery_status, delivery_deviation FROM order_parts WHERE order_id = ?',
-            (order_id,))
-        parts = self.c.fetchall()
+        self.c.execute(FETCH_ORDER_PARTS_SQL, (order_id,))
+        parts = []
+        for (part_id, order_id, part_name, supplier_id, planned_delivery_date, actual_delivery_date, status_id,
+             delivery_deviation, planned_delivery_day, actual_delivery_day) in self.c.fetchall():
+            parts.append(OrderPart(part_id, order_id, part_name, self.suppliers.name(supplier_id),
+                                   planned_delivery_date, actual_delivery_date, self.statuses.name(status_id),
+                                   delivery_deviation, planned_delivery_day, actual_delivery_day))
         return parts
 
+    def fetch_supplier_names(self):
+        return sorted(self.suppliers.ids)
+
+    @bumps('orders', 'order_impact')
     def add_order(self, order_name, customer_name, delivery_date, salesperson, order_amount):
         try:
             self.c.execute(
                 'INSERT INTO orders (order_name, customer_name, delivery_date, salesperson, order_amount) VALUES (?, ?, ?, ?, ?)',
                 (order_name, customer_name, delivery_date, salesperson, order_amount))
+            self.c.execute('INSERT INTO order_impact (order_id, max_lateness) VALUES (?, NULL)', (self.c.lastrowid,))
             self.conn.commit()
             return True
         except sqlite3.Error as e:
             print(f"Error adding order: {e}")
 
-    def calculate_delivery_deviation(self, planned_date, actual_date):
-        if planned_date and actual_date:
-            planned_date_dt = QDate.fromString(planned_date, 'yyyy-MM-dd')
-            actual_date_dt = QDate.fromString(actual_date, 'yyyy-MM-dd')
-            deviation = (actual_date_dt.toJulianDay() - planned_date_dt.toJulianDay()) / 30.0
+    def calculate_delivery_deviation(self, planned_day, actual_day):
+        if planned_day is not None and actual_day is not None:
+            deviation = (actual_day - planned_day) / 30.0
             return max(deviation, 0.0)
         return 0.0
 
+    @bumps('order_parts', 'overdue_parts', 'order_impact')
     def add_order_part(self, order_id, part_name, supplier, planned_delivery_date, actual_delivery_date,
                        delivery_status):
-        delivery_deviation = self.calculate_delivery_deviation(planned_delivery_date, actual_delivery_date)
+        planned_day = date_to_day(planned_delivery_date)
+        actual_day = date_to_day(actual_delivery_date)
+        delivery_deviation = self.calculate_delivery_deviation(planned_day, actual_day)
+
+        supplier_id = self.suppliers.intern(self.c, supplier)
+        status_id = self.statuses.intern(self.c, delivery_status)
 
         self.c.execute(
-            'INSERT INTO order_parts (order_id, part_name, supplier, planned_delivery_date, actual_delivery_date, delivery_status, delivery_deviation) VALUES (?, ?, ?, ?, ?, ?, ?)',
-            (order_id, part_name, supplier, planned_delivery_date, actual_delivery_date, delivery_status,
-             delivery_deviation))
+            'INSERT INTO order_parts (order_id, part_name, supplier_id, planned_delivery_date, actual_delivery_date, status_id, delivery_deviation, planned_delivery_day, actual_delivery_day) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (order_id, part_name, supplier_id, planned_delivery_date, actual_delivery_date, status_id,
+             delivery_deviation, planned_day, actual_day))
+        self.update_overdue_flag(self.c.lastrowid, order_id, planned_day, actual_day)
+        self.update_order_impact(order_id, None, part_lateness(planned_day, actual_day))
         self.conn.commit()
         return True
 
+    @bumps('order_parts', 'overdue_parts', 'order_impact')
     def update_order_part(self, part_id, part_name, supplier, planned_delivery_date, actual_delivery_date,
                           delivery_status):
-        self.c.execute('SELECT planned_delivery_date, actual_delivery_date FROM order_parts WHERE part_id = ?',
-                       (part_id,))
+        self.c.execute(
+            'SELECT order_id, planned_delivery_date, actual_delivery_date, planned_delivery_day, actual_delivery_day FROM order_parts WHERE part_id = ?',
+            (part_id,))
         result = self.c.fetchone()
 
         if result:
-            stored_planned_delivery_date, stored_actual_delivery_date = result
+            order_id, stored_planned_delivery_date, stored_actual_delivery_date, stored_planned_day, stored_actual_day = result
 
             planned_delivery_date = planned_delivery_date if planned_delivery_date else stored_planned_delivery_date
             actual_delivery_date = actual_delivery_date if actual_delivery_date else stored_actual_delivery_date
 
-            delivery_deviation = self.calculate_delivery_deviation(planned_delivery_date, actual_delivery_date)
+            planned_day = date_to_day(planned_delivery_date)
+            actual_day = date_to_day(actual_delivery_date)
+            delivery_deviation = self.calculate_delivery_deviation(planned_day, actual_day)
+            supplier_id = self.suppliers.intern(self.c, supplier)
+            status_id = self.statuses.intern(self.c, delivery_status)
 
             self.c.execute(
-                'UPDATE order_parts SET part_name = ?, supplier = ?, planned_delivery_date = ?, actual_delivery_date = ?, delivery_status = ?, delivery_deviation = ? WHERE part_id = ?',
-                (part_name, supplier, planned_delivery_date, actual_delivery_date, delivery_status, delivery_deviation,
-                 part_id))
+                'UPDATE order_parts SET part_name = ?, supplier_id = ?, planned_delivery_date = ?, actual_delivery_date = ?, status_id = ?, delivery_deviation = ?, planned_delivery_day = ?, actual_delivery_day = ? WHERE part_id = ?',
+                (part_name, supplier_id, planned_delivery_date, actual_delivery_date, status_id, delivery_deviation,
+                 planned_day, actual_day, part_id))
+            self.update_overdue_flag(part_id, order_id, planned_day, actual_day)
+            self.update_order_impact(order_id, part_lateness(stored_planned_day, stored_actual_day),
+                                     part_lateness(planned_day, actual_day))
             self.conn.commit()
             return True
         else:
             return False
 
+    @bumps('order_parts', 'overdue_parts', 'order_impact')
     def delete_order_part(self, part_id):
+        self.c.execute('SELECT order_id, planned_delivery_day, actual_delivery_day FROM order_parts WHERE part_id = ?',
+                       (part_id,))
+        result = self.c.fetchone()
         self.c.execute('DELETE FROM order_parts WHERE part_id = ?', (part_id,))
+        self.c.execute('DELETE FROM overdue_parts WHERE part_id = ?', (part_id,))
+        if result:
+            order_id, planned_day, actual_day = result
+            self.update_order_impact(order_id, part_lateness(planned_day, actual_day), None)
         self.conn.commit()
 
+    @cached_read('orders', 'order_parts')
     def get_order_deviation_data(self):
+        # 订单名称可能重复，按 order_id 分组
         self.c.execute('''
-            SELECT orders.order_name, order_parts.part_name, order_parts.delivery_deviation 
+            SELECT orders.order_id, orders.order_name, order_parts.part_name, order_parts.delivery_deviation 
             FROM orders 
             JOIN order_parts ON orders.order_id = order_parts.order_id
         ''')
         data = self.c.fetchall()
 
         order_data = {}
-        for order_name, part_name, deviation in data:
-            if order_name not in order_data:
-                order_data[order_name] = []
-            order_data[order_name].append((part_name, deviation))
+        for order_id, order_name, part_name, deviation in data:
+            if order_id not in order_data:
+                order_data[order_id] = (order_name, [])
+            order_data[order_id][1].append((part_name, deviation))
 
-        result = [(order_name, parts) for order_name, parts in order_data.items()]
+        result = [(order_id, order_name, parts) for order_id, (order_name, parts) in order_data.items()]
         return result
 
+    def fetch_parts_due_between(self, start_day, end_day):
+        # 按计划交期(julian day，闭区间)查询零件，偏差在 SQLite 内用整数计算
+        self.c.execute('''
+            SELECT orders.order_name, order_parts.part_id, order_parts.part_name, order_parts.supplier_id,
+                   order_parts.planned_delivery_day, order_parts.actual_delivery_day,
+                   COALESCE(MAX((order_parts.actual_delivery_day - order_parts.planned_delivery_day) / 30.0, 0.0), 0.0)
+            FROM order_parts
+            JOIN orders ON orders.order_id = order_parts.order_id
+            WHERE order_parts.planned_delivery_day BETWEEN ? AND ?
+            ORDER BY order_parts.planned_delivery_day
+        ''', (start_day, end_day))
+        return [(order_name, part_id, part_name, self.suppliers.name(supplier_id), planned_day, actual_day, deviation)
+                for order_name, part_id, part_name, supplier_id, planned_day, actual_day, deviation
+                in self.c.fetchall()]
+
+    def fetch_parts_due_this_week(self, today=None):
+        today = today or QDate.currentDate()
+        start_day = today.toJulianDay() - (today.dayOfWeek() - 1)
+        return self.fetch_parts_due_between(start_day, start_day + 6)
+
+    @cached_read('orders', 'order_parts')
+    def fetch_part_row_offsets(self):
+        """ 时间轴按订单、零件排序，每个零件占一行；返回 ([order_id], [该订单第一个零件的行号], 零件总数)，
+        只按订单聚合，不为每个零件生成行号。筛选条件须与 fetch_parts_in_rows 一致，否则行号会错位 """
+        self.c.execute('''
+            SELECT order_parts.order_id, COUNT(*)
+            FROM order_parts
+            CROSS JOIN orders ON orders.order_id = order_parts.order_id
+            WHERE order_parts.planned_delivery_day IS NOT NULL
+            GROUP BY order_parts.order_id
+            ORDER BY order_parts.order_id
+        ''')
+        order_ids, offsets, total = [], [], 0
+        for order_id, count in self.c.fetchall():
+            order_ids.append(order_id)
+            offsets.append(total)
+            total += count
+        return order_ids, offsets, total
+
+    def fetch_parts_in_rows(self, first_row, last_row):
+        """ 返回时间轴第 first_row ~ last_row 行(闭区间)的零件，结果条数不超过行数；没有计划交期的零件不上时间轴 """
+        order_ids, offsets, total = self.fetch_part_row_offsets()
+        first_row, last_row = max(first_row, 0), min(last_row, total - 1)
+        if first_row > last_row:
+            return []
+        # 从第一行所在的订单开始沿 order_id 索引顺序读取，OFFSET 只跳过该订单内的零件
+        index = bisect.bisect_right(offsets, first_row) - 1
+        self.c.execute('''
+            SELECT orders.order_name, order_parts.part_id, order_parts.part_name, order_parts.supplier_id,
+                   order_parts.planned_delivery_day, order_parts.actual_delivery_day
+            FROM order_parts
+            CROSS JOIN orders ON orders.order_id = order_parts.order_id
+            WHERE order_parts.order_id >= ? AND order_parts.planned_delivery_day IS NOT NULL
+            ORDER BY order_parts.order_id, order_parts.part_id
+            LIMIT ? OFFSET ?
+        ''', (order_ids[index], last_row - first_row + 1, first_row - offsets[index]))
+        return [(row, order_name, part_id, part_name, self.suppliers.name(supplier_id), planned_day, actual_day)
+                for row, (order_name, part_id, part_name, supplier_id, planned_day, actual_day)
+                in enumerate(self.c.fetchall(), first_row)]
+
+    @cached_read('order_parts')
+    def fetch_part_day_bounds(self):
+        self.c.execute('''
+            SELECT MIN(MIN(planned_delivery_day, COALESCE(actual_delivery_day, planned_delivery_day))),
+                   MAX(MAX(planned_delivery_day, COALESCE(actual_delivery_day, planned_delivery_day)))
+            FROM order_parts
+        ''')
+        return self.c.fetchone()
+
+    @bumps('orders', 'order_parts', 'overdue_parts', 'order_impact')
     def delete_order(self, order_id):
         try:
             self.c.execute('DELETE FROM order_parts WHERE order_id = ?', (order_id,))
+            self.c.execute('DELETE FROM overdue_parts WHERE order_id = ?', (order_id,))
+            self.c.execute('DELETE FROM order_impact WHERE order_id = ?', (order_id,))
             self.c.execute('DELETE FROM orders WHERE order_id = ?', (order_id,))
             self.conn.commit()
         except sqlite3.Error as e:
             print(f"Error deleting order: {e}")
+
+    def get_last_sweep_day(self):
+        self.c.execute("SELECT last_day FROM sweep_state WHERE name = 'overdue'")
+        result = self.c.fetchone()
+        return result[0] if result else None
+
+    def update_overdue_flag(self, part_id, order_id, planned_day, actual_day):
+        # 单个零件写入时同步逾期标记；计划交期在上次扫描日及之后的留给下一次扫描处理
+        self.c.execute('DELETE FROM overdue_parts WHERE part_id = ?', (part_id,))
+        last_sweep_day = self.get_last_sweep_day()
+        if (actual_day is None and planned_day is not None and last_sweep_day is not None
+                and planned_day < last_sweep_day):
+            self.c.execute('INSERT INTO overdue_parts (part_id, order_id, planned_delivery_day) VALUES (?, ?, ?)',
+                           (part_id, order_id, planned_day))
+
+    @bumps('overdue_parts')
+    def sweep_overdue_parts(self, today=None):
+        """ 增量逾期扫描: 只处理自上次扫描以来计划交期已过、仍未交货的零件，返回新增逾期数 """
+        today_day = (today or QDate.currentDate()).toJulianDay()
+        last_sweep_day = self.get_last_sweep_day()
+        if last_sweep_day is not None and last_sweep_day >= today_day:
+            return 0
+
+        # 首次扫描时从 julian day 0 开始，即全部历史零件
+        self.c.execute('''INSERT OR IGNORE INTO overdue_parts (part_id, order_id, planned_delivery_day)
+                          SELECT part_id, order_id, planned_delivery_day
+                          FROM order_parts INDEXED BY idx_order_parts_undelivered
+                          WHERE actual_delivery_day IS NULL
+                            AND planned_delivery_day >= ? AND planned_delivery_day < ?''',
+                       (last_sweep_day or 0, today_day))
+        new_overdue = self.c.rowcount
+        self.c.execute("INSERT OR REPLACE INTO sweep_state (name, last_day) VALUES ('overdue', ?)", (today_day,))
+        self.conn.commit()
+        return new_overdue
+
+    @cached_read('orders', 'overdue_parts')
+    def fetch_overdue_summary(self):
+        self.c.execute('''
+            SELECT orders.order_name, COUNT(*), MIN(overdue_parts.planned_delivery_day)
+            FROM overdue_parts
+            JOIN orders ON orders.order_id = overdue_parts.order_id
+            GROUP BY overdue_parts.order_id
+            ORDER BY COUNT(*) DESC
+        ''')
+        return self.c.fetchall()
+
+    def recompute_order_impact(self, order_id):
+        self.c.execute('''INSERT OR REPLACE INTO order_impact (order_id, max_lateness)
+                          SELECT ?, MAX(actual_delivery_day - planned_delivery_day)
+                          FROM order_parts WHERE order_id = ?''', (order_id, order_id))
+
+    def update_order_impact(self, order_id, old_lateness, new_lateness):
+        """ 零件延期天数由 old_lateness 变为 new_lateness 时更新所属订单的最大延期，
+        只有原先的最大值被调小或删除时才需要重新扫描该订单的零件 """
+        self.c.execute('SELECT max_lateness FROM order_impact WHERE order_id = ?', (order_id,))
+        result = self.c.fetchone()
+        if result is None:
+            self.recompute_order_impact(order_id)
+            return
+
+        max_lateness = result[0]
+        if new_lateness is not None and (max_lateness is None or new_lateness >= max_lateness):
+            self.c.execute('UPDATE order_impact SET max_lateness = ? WHERE order_id = ?', (new_lateness, order_id))
+        elif old_lateness is not None and max_lateness is not None and old_lateness >= max_lateness:
+            self.recompute_order_impact(order_id)
+
+    def fetch_order_impacts(self, today=None):
+        """ 返回 {order_id: (承诺交期, 预计交期, 是否有延期风险)}，预计交期 = 承诺交期 + 零件最大延期天数，
+        未交货且已过计划交期的零件按至今已延期的天数计入 """
+        today = today or QDate.currentDate()
+        return self.fetch_order_impacts_on(today.toJulianDay())
+
+    @cached_read('orders', 'order_parts', 'order_impact')
+    def fetch_order_impacts_on(self, today_day):
+        self.c.execute('''
+            SELECT order_id, ? - MIN(planned_delivery_day)
+            FROM order_parts INDEXED BY idx_order_parts_undelivered
+            WHERE actual_delivery_day IS NULL AND planned_delivery_day < ?
+            GROUP BY order_id
+        ''', (today_day, today_day))
+        pending_lateness = dict(self.c.fetchall())
+
+        self.c.execute('SELECT order_id, max_lateness FROM order_impact')
+        max_lateness = dict(self.c.fetchall())
+
+        impacts = {}
+        for order in self.fetch_orders():
+            promised_day = date_to_day(order.delivery_date)
+            delay = max(max_lateness.get(order.order_id) or 0, pending_lateness.get(order.order_id, 0), 0)
+            projected_date = day_to_date(promised_day + delay) if promised_day is not None else ''
+            impacts[order.order_id] = (order.delivery_date, projected_date, delay > 0)
+        return impacts
@@ -0,0 +1,86 @@
+# coding:utf-8
+import gc
+import os
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+from PyQt5.QtCore import QObject
+from PyQt5.QtWidgets import QTableWidgetItem
+from matplotlib.figure import Figure
+
+MEMDIAG_ENV = 'SUPPLY_PROGRESS_MEMDIAG'
+
+
+def memory_diagnostics_enabled(argv):
+    return '--memdiag' in argv or os.environ.get(MEMDIAG_ENV) == '1'
+
+
+def count_live_objects():
+    """ 按类型统计存活的 Qt 对象、QTableWidgetItem 和 matplotlib Figure """
+    gc.collect()
+    counts = Counter()
+    for obj in gc.get_objects():
+        if isinstance(obj, (QObject, QTableWidgetItem, Figure)):
+            counts[type(obj).__name__] += 1
+    return counts
+
+
+class MemoryDiagnostics:
+    """ 内存诊断模式: 在每次页面切换前后记录 tracemalloc 快照和存活对象数，输出增长最多的分配位置和对象类型 """
+
+    def __init__(self, frames=5, top=10):
+        self.top = top
+        self.baseline_snapshot = None
+        self.baseline_counts = None
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    @contextmanager
+    def measure(self, label):
+        gc.collect()
+        snapshot = self.take_snapshot()
+        counts = count_live_objects()
+        if self.baseline_snapshot is None:
+            self.baseline_snapshot = snapshot
+            self.baseline_counts = counts
+        start = time.perf_counter()
+
+        yield
+
+        elapsed = time.perf_counter() - start
+        gc.collect()
+        after_snapshot = self.take_snapshot()
+        after_counts = count_live_objects()
+        self.report(label, elapsed, snapshot, counts, after_snapshot, after_counts)
+
+    def take_snapshot(self):
+        # 排除诊断本身的分配
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+
+    def report(self, label, elapsed, snapshot, counts, after_snapshot, after_counts):
+        current, peak = tracemalloc.get_traced_memory()
+        print(f'[memdiag] {label}: {elapsed * 1000:.1f} ms, '
+              f'traced {current / 1024:.1f} KiB (peak {peak / 1024:.1f} KiB)')
+
+        print('[memdiag]   allocation growth during this switch:')
+        self.print_allocation_growth(after_snapshot.compare_to(snapshot, 'lineno'))
+        print('[memdiag]   allocation growth since first switch:')
+        self.print_allocation_growth(after_snapshot.compare_to(self.baseline_snapshot, 'lineno'))
+
+        print('[memdiag]   live object growth (this switch / since first switch):')
+        names = set(after_counts) | set(self.baseline_counts)
+        growth = sorted(((after_counts[name] - counts[name], after_counts[name] - self.baseline_counts[name], name)
+                         for name in names), key=lambda item: (-item[1], -item[0]))
+        for delta, total_delta, name in growth[:self.top]:
+            if delta or total_delta:
+                print(f'[memdiag]     {name}: {delta:+d} / {total_delta:+d} (live {after_counts[name]})')
+
+    def print_allocation_growth(self, stats):
+        growth = [stat for stat in stats if stat.size_diff > 0]
+        for stat in growth[:self.top]:
+            print(f'[memdiag]     {stat.traceback[0]}: {stat.size_diff / 1024:+.1f} KiB, {stat.count_diff:+d} blocks')
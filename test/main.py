@@ -1,21 +1,28 @@
 # coding:utf-8
+import heapq
 import os
 import sys
 
-from PyQt5.QtCore import QRect, QDate
+import numpy as np
+
+from PyQt5.QtCore import QRect, QDate, QTimer, QStringListModel
 from PyQt5.QtCore import Qt, QUrl
 from PyQt5.QtGui import QIcon, QFont
 from PyQt5.QtGui import QPainter, QImage, QColor, QBrush, QDesktopServices
 from PyQt5.QtWidgets import QApplication, QFrame, QStackedWidget, QHBoxLayout, QLabel, QVBoxLayout, QTableWidget, \
     QTableWidgetItem, QWidget, QSizePolicy, QDialog, QStyledItemDelegate, QDateEdit, QPushButton
-from PyQt5.QtWidgets import QGridLayout
+from PyQt5.QtWidgets import QGridLayout, QCompleter
 from matplotlib import rcParams
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 from matplotlib.ticker import MaxNLocator
 from qframelesswindow import FramelessWindow, TitleBar
 
-from database import Database
+from backup import BackupManager
+from database import Database, day_to_date
+from diagnostics import MemoryDiagnostics, memory_diagnostics_enabled
+from order_picker import OrderListModel, OrderPicker
+from timeline import TimelinePage
 from qfluentwidgets import FluentIcon as FIF, ScrollArea, PrimaryPushButton
 from qfluentwidgets import (LineEdit, PushButton, ComboBox, CalendarPicker)
 from qfluentwidgets import (NavigationInterface, NavigationItemPosition, NavigationWidget, MessageBox, InfoBar,
@@ -24,6 +31,9 @@ from qfluentwidgets import (NavigationInterface, NavigationItemPosition, Navigat
 
 # coding:utf-8
 
+BACKUP_INTERVAL = 6 * 60 * 60  # 秒
+
+
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
     try:
@@ -116,10 +126,11 @@ class CustomTitleBar(TitleBar):
 
 
 class AddOrderInterface(QWidget):
-    def __init__(self, db, parent=None):
+    def __init__(self, db, order_model, parent=None):
         super().__init__(parent)
         self.setObjectName('AddOrderInterface')
         self.db = db
+        self.order_model = order_model
         self.initUI1()
 
     def initUI1(self):
@@ -188,9 +199,8 @@ class AddOrderInterface(QWidget):
         form_layout.setContentsMargins(30, 0, 30, 30)
 
         form_layout.addWidget(QLabel('订单名称'), 0, 0)
-        self.order_name_combobox = ComboBox()
-        form_layout.addWidget(self.order_name_combobox, 0, 1)
-        self.order_name_combobox.setCurrentIndex(-1)
+        self.order_picker = OrderPicker(self.order_model)
+        form_layout.addWidget(self.order_picker, 0, 1)
 
         form_layout.addWidget(QLabel('部件名称'), 0, 2)
         self.part_name_input = LineEdit()
@@ -199,6 +209,12 @@ class AddOrderInterface(QWidget):
         form_layout.addWidget(QLabel('供应商'), 1, 0)
         self.supplier_input = LineEdit()
         form_layout.addWidget(self.supplier_input, 1, 1)
+        # 供应商输入联想，候选项来自 suppliers 表
+        self.supplier_model = QStringListModel(self)
+        supplier_completer = QCompleter(self.supplier_model, self)
+        supplier_completer.setCaseSensitivity(Qt.CaseInsensitive)
+        supplier_completer.setFilterMode(Qt.MatchContains)
+        self.supplier_input.setCompleter(supplier_completer)
 
         form_layout.addWidget(QLabel('计划交期'), 1, 2)
         self.planned_delivery_date_input = CalendarPicker(self)
@@ -234,16 +250,16 @@ class AddOrderInterface(QWidget):
         self.setLayout(main_layout)
 
         self.update_order_names()
+        self.update_supplier_names()
 
     def sync_actual_delivery_date(self, date):
         self.actual_delivery_date_input.setDate(date)
 
     def update_order_names(self):
-        order_names = self.db.fetch_order_names()
-        self.order_name_combobox.clear()
-        for name in order_names.values():
-            self.order_name_combobox.addItem(name)
-        self.order_name_combobox.setCurrentIndex(-1)
+        self.order_picker.refresh()
+
+    def update_supplier_names(self):
+        self.supplier_model.setStringList(self.db.fetch_supplier_names())
 
     def add_order(self):
         order_name = self.order_name_input.text()
@@ -278,8 +294,8 @@ class AddOrderInterface(QWidget):
             self.update_order_names()
 
     def add_order_part(self):
-        order_name = self.order_name_combobox.currentText()
-        if not order_name:
+        order_id = self.order_picker.currentOrderId()
+        if order_id is None:
             InfoBar.error(
                 title='错误',
                 content='订单名称不能为空！',
@@ -289,8 +305,6 @@ class AddOrderInterface(QWidget):
                 parent=self
             )
             return
-        order_id = list(self.db.fetch_order_names().keys())[
-            list(self.db.fetch_order_names().values()).index(order_name)]
         part_name = self.part_name_input.text()
         supplier = self.supplier_input.text()
         planned_delivery_date = self.planned_delivery_date_input.getDate().toString('yyyy-MM-dd')
@@ -317,9 +331,10 @@ class AddOrderInterface(QWidget):
                 duration=2000,
                 parent=self
             )
-            self.order_name_combobox.setCurrentIndex(-1)
+            self.order_picker.clear()
             self.part_name_input.clear()
             self.supplier_input.clear()
+            self.update_supplier_names()
             self.planned_delivery_date_input.setDate(QDate())
             self.actual_delivery_date_input.setDate(QDate())
             self.delivery_status_combobox.setCurrentIndex(-1)
@@ -357,10 +372,16 @@ class DateDelegate(QStyledItemDelegate):
 
 
 class MaintenanceInterface(QWidget):
-    def __init__(self, db, parent=None):
+    PART_COLUMNS = ('part_id', 'part_name', 'supplier', 'planned_delivery_date', 'actual_delivery_date',
+                    'delivery_status', 'delivery_deviation')
+
+    def __init__(self, db, order_model, parent=None):
         super().__init__(parent)
         self.setObjectName('MaintenanceInterface')
         self.db = db
+        self.order_model = order_model
+        self.parts = []  # 当前表格中每一行对应的 OrderPart
+        self.dirty_rows = set()  # 被编辑过、需要保存的行
         self.initUI()
 
     def initUI(self):
@@ -377,9 +398,9 @@ class MaintenanceInterface(QWidget):
         form_layout.setContentsMargins(30, 30, 30, 30)
 
         form_layout.addWidget(QLabel('订单名称'), 0, 0, Qt.AlignRight)
-        self.maintenance_order_combobox = ComboBox()
-        form_layout.addWidget(self.maintenance_order_combobox, 0, 1)
-        self.maintenance_order_combobox.currentIndexChanged.connect(self.load_order_parts)
+        self.maintenance_order_picker = OrderPicker(self.order_model)
+        form_layout.addWidget(self.maintenance_order_picker, 0, 1)
+        self.maintenance_order_picker.orderChanged.connect(self.load_order_parts)
 
         form_layout.setColumnStretch(1, 2)  # 设置第2列的伸展因子
 
@@ -391,6 +412,7 @@ class MaintenanceInterface(QWidget):
         self.tableView.setHorizontalHeaderLabels(
             ['零件ID', '零件名称', '供应商', '计划交期', '实际交货日期', '交货情况', '交期偏差率'])
         self.tableView.setWordWrap(False)
+        self.tableView.itemChanged.connect(self.mark_row_dirty)
 
         # 设置日期委托
         date_delegate = DateDelegate()
@@ -424,33 +446,45 @@ class MaintenanceInterface(QWidget):
         """)
 
     def update_order_names(self):
-        order_names = self.db.fetch_order_names()
-        self.maintenance_order_combobox.clear()
-        self.maintenance_order_combobox.addItem('')  # 添加一个空选项
-        for name in order_names.values():
-            self.maintenance_order_combobox.addItem(name)
-        self.maintenance_order_combobox.setCurrentIndex(-1)  # 设置默认值为空
+        # 订单被删除时 orderChanged 会清空表格，否则重新加载以反映其他界面新增的零件
+        self.maintenance_order_picker.refresh()
+        self.load_order_parts()
 
     def load_order_parts(self):
-        order_name = self.maintenance_order_combobox.currentText()
-        if not order_name:
+        order_id = self.maintenance_order_picker.currentOrderId()
+        if order_id is None:
             self.tableView.setRowCount(0)
+            self.parts = []
+            self.dirty_rows.clear()
             return
 
-        order_id = list(self.db.fetch_order_names().keys())[
-            list(self.db.fetch_order_names().values()).index(order_name)]
-        parts = self.db.fetch_order_parts(order_id)
-
-        self.tableView.setRowCount(0)
-        for part in parts:
-            row_position = self.tableView.rowCount()
-            self.tableView.insertRow(row_position)
-            for i, item in enumerate(part):
-                self.tableView.setItem(row_position, i, QTableWidgetItem(str(item)))
+        # 缓存中的列表在调用方之间共享，删除行时修改的是副本
+        self.parts = list(self.db.fetch_order_parts(order_id))
+
+        # 填充表格时不触发 itemChanged
+        self.tableView.blockSignals(True)
+        self.tableView.setRowCount(len(self.parts))
+        for row, part in enumerate(self.parts):
+            for column, attr in enumerate(self.PART_COLUMNS):
+                self.tableView.setItem(row, column, QTableWidgetItem(self.format_cell(attr, getattr(part, attr))))
+        self.tableView.blockSignals(False)
+        self.dirty_rows.clear()
+
+    @staticmethod
+    def format_cell(attr, value):
+        if value is None:
+            return ''
+        if attr == 'delivery_deviation':
+            return f'{value:.2f}'
+        return str(value)
+
+    def mark_row_dirty(self, item):
+        self.dirty_rows.add(item.row())
 
     def save_data(self):
-        for row in range(self.tableView.rowCount()):
-            part_id = self.tableView.item(row, 0).text()
+        # 只保存被编辑过的行
+        for row in sorted(self.dirty_rows):
+            part_id = self.parts[row].part_id
             part_name = self.tableView.item(row, 1).text()
             supplier = self.tableView.item(row, 2).text()
             planned_delivery_date = self.tableView.item(row, 3).text()
@@ -471,8 +505,8 @@ class MaintenanceInterface(QWidget):
         )
 
     def delete_order(self):
-        order_name = self.maintenance_order_combobox.currentText()
-        if not order_name:
+        order_id = self.maintenance_order_picker.currentOrderId()
+        if order_id is None:
             InfoBar.error(
                 title='错误',
                 content='请选择一个订单',
@@ -492,9 +526,8 @@ class MaintenanceInterface(QWidget):
         w.cancelButton.setText('取消')
 
         if w.exec_() == QDialog.Accepted:
-            order_id = list(self.db.fetch_order_names().keys())[
-                list(self.db.fetch_order_names().values()).index(order_name)]
             self.db.delete_order(order_id)
+            self.maintenance_order_picker.clear()
             self.update_order_names()
             self.tableView.setRowCount(0)
             InfoBar.success(
@@ -509,9 +542,11 @@ class MaintenanceInterface(QWidget):
     def delete_selected_part(self):
         selected_row = self.tableView.currentRow()
         if selected_row >= 0:
-            part_id = self.tableView.item(selected_row, 0).text()
+            part_id = self.parts.pop(selected_row).part_id
             self.db.delete_order_part(part_id)
             self.tableView.removeRow(selected_row)
+            self.dirty_rows = {row if row < selected_row else row - 1
+                               for row in self.dirty_rows if row != selected_row}
             InfoBar.success(
                 title='成功',
                 content='零件删除成功！',
@@ -522,7 +557,67 @@ class MaintenanceInterface(QWidget):
             )
 
 
+class OverdueAlertPanel(QFrame):
+    """ 逾期未交零件提醒面板，同时汇总本周计划到货的零件 """
+    MAX_ORDERS_SHOWN = 5
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent=parent)
+        self.setObjectName('OverdueAlertPanel')
+        self.db = db
+
+        font = QFont()
+        font.setPointSize(12)
+        font.setBold(True)
+        self.title_label = QLabel(self)
+        self.title_label.setFont(font)
+        self.detail_label = QLabel(self)
+        self.week_label = QLabel(self)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 10, 20, 10)
+        layout.addWidget(self.title_label)
+        layout.addWidget(self.detail_label)
+        layout.addWidget(self.week_label)
+
+        self.setStyleSheet("""
+            #OverdueAlertPanel {
+                border: 1px solid #dcdcdc;
+                border-radius: 8px;
+            }
+        """)
+        self.refresh()
+
+    def refresh(self):
+        self.refresh_week_summary()
+        summary = self.db.fetch_overdue_summary()
+        total = sum(count for _, count, _ in summary)
+        if not total:
+            self.title_label.setText('暂无逾期未交零件')
+            self.detail_label.hide()
+            return
+
+        self.title_label.setText(f'逾期未交零件 {total} 个，涉及 {len(summary)} 个订单')
+        lines = [f'订单{order_name}: {count} 个，最早计划交期 {day_to_date(earliest_day)}'
+                 for order_name, count, earliest_day in summary[:self.MAX_ORDERS_SHOWN]]
+        if len(summary) > self.MAX_ORDERS_SHOWN:
+            lines.append(f'…… 其余 {len(summary) - self.MAX_ORDERS_SHOWN} 个订单')
+        self.detail_label.setText('\n'.join(lines))
+        self.detail_label.show()
+
+    def refresh_week_summary(self):
+        parts = self.db.fetch_parts_due_this_week()
+        delivered = sum(1 for part in parts if part[5] is not None)
+        late = sum(1 for part in parts if part[6] > 0)
+        self.week_label.setText(f'本周计划到货零件 {len(parts)} 个，已到货 {delivered} 个，其中延期 {late} 个')
+
+
 class OverviewPage(QWidget):
+    # 零件数超过阈值时改为绘制 偏差最大的 TOP N + 偏差分布直方图，保证绘制耗时与订单规模无关
+    LOD_PART_THRESHOLD = 50
+    LOD_TOP_N = 20
+    LOD_BINS = 20
+
     def __init__(self, db, parent=None):
         super().__init__(parent=parent)
         self.setObjectName('OverviewPage')
@@ -532,6 +627,10 @@ class OverviewPage(QWidget):
     def initUI(self):
         layout = QVBoxLayout(self)
 
+        # 逾期提醒面板
+        self.overdue_panel = OverdueAlertPanel(self.db, self)
+        layout.addWidget(self.overdue_panel)
+
         # 创建滚动区域
         scroll_area = ScrollArea(self)
         scroll_area.setWidgetResizable(True)
@@ -540,6 +639,7 @@ class OverviewPage(QWidget):
         scroll_layout = QGridLayout(scroll_content)
         scroll_content.setLayout(scroll_layout)
         scroll_area.setWidget(scroll_content)
+        self.scroll_layout = scroll_layout
 
         # 添加滚动区域到主布局
         layout.addWidget(scroll_area)
@@ -553,7 +653,7 @@ class OverviewPage(QWidget):
         rcParams['axes.unicode_minus'] = False  # 正常显示负号
 
         if layout is None:
-            layout = self.layout().itemAt(0).widget().widget().layout()
+            layout = self.scroll_layout
 
             # 清空布局中的所有控件
         for i in reversed(range(layout.count())):
@@ -562,43 +662,31 @@ class OverviewPage(QWidget):
             widget_to_remove.setParent(None)
 
         data = self.db.get_order_deviation_data()
+        impacts = self.db.fetch_order_impacts()
 
         max_plots_per_page = 6
         cols = 2  # 每行显示两个图表
 
         for index, order_data in enumerate(data):
-            order_name = order_data[0]
-            part_deviations = order_data[1]  # 假设 part_deviations 是一个列表，每个元素是 (零件名, 偏差率)
-
-            part_names = [part[0] for part in part_deviations]
-            deviations = [part[1] for part in part_deviations]
+            order_id = order_data[0]
+            order_name = order_data[1]
+            part_deviations = order_data[2]  # 假设 part_deviations 是一个列表，每个元素是 (零件名, 偏差率)
 
             figure = Figure(figsize=(5, 4))
             canvas = FigureCanvas(figure)
 
-            ax = figure.add_subplot(1, 1, 1)
-            ax.clear()
-
-            # 绘制条形图
-            bars = ax.bar(part_names, deviations, color='#1f77b4')
-
-            # 添加数据标签
-            for bar in bars:
-                yval = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width() / 2, yval, round(yval, 2), va='bottom')  # va: vertical alignment
-
-            # 添加网格线
-            ax.yaxis.set_major_locator(MaxNLocator(integer=True))
-            ax.grid(True, which='both', linestyle='--', linewidth=0.5)
-
-            # 设置标签和标题
-            ax.set_xlabel('零件名称', fontsize=10)
-            ax.set_ylabel('交期偏差率', fontsize=10)
-            ax.set_title(f'订单{order_name}的零部件交期偏差率', fontsize=12, fontweight='bold')
+            if len(part_deviations) > self.LOD_PART_THRESHOLD:
+                self.plot_order_summary(figure, canvas, order_name, part_deviations)
+            else:
+                ax = figure.add_subplot(1, 1, 1)
+                self.plot_part_bars(ax, part_deviations)
+                ax.set_title(f'订单{order_name}的零部件交期偏差率', fontsize=12, fontweight='bold')
 
             # 设置上下边距
             plot_widget = QWidget()
             plot_layout = QVBoxLayout()
+            if order_id in impacts:
+                plot_layout.addWidget(self.create_impact_label(*impacts[order_id]))
             plot_layout.addWidget(canvas)
             plot_layout.setContentsMargins(0, 20, 0, 20)  # 设置上下边距
             plot_widget.setLayout(plot_layout)
@@ -610,6 +698,75 @@ class OverviewPage(QWidget):
 
         layout.setRowStretch((len(data) + 1) // cols, 1)
 
+    @staticmethod
+    def create_impact_label(promised_date, projected_date, at_risk):
+        label = QLabel(f'承诺交期 {promised_date}    预计交期 {projected_date}' + ('    ⚠ 有延期风险' if at_risk else ''))
+        label.setAlignment(Qt.AlignCenter)
+        if at_risk:
+            label.setStyleSheet('color: #d62728; font-weight: bold;')
+        return label
+
+    def plot_part_bars(self, ax, part_deviations):
+        part_names = [part[0] for part in part_deviations]
+        deviations = [part[1] for part in part_deviations]
+
+        ax.clear()
+
+        # 绘制条形图
+        bars = ax.bar(part_names, deviations, color='#1f77b4')
+
+        # 添加数据标签
+        for bar in bars:
+            yval = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width() / 2, yval, round(yval, 2), va='bottom')  # va: vertical alignment
+
+        # 添加网格线
+        ax.yaxis.set_major_locator(MaxNLocator(integer=True))
+        ax.grid(True, which='both', linestyle='--', linewidth=0.5)
+
+        # 设置标签
+        ax.set_xlabel('零件名称', fontsize=10)
+        ax.set_ylabel('交期偏差率', fontsize=10)
+
+    def plot_order_summary(self, figure, canvas, order_name, part_deviations):
+        """ 大订单: 上方为偏差最大的 TOP N 零件，下方为偏差分布直方图，点击直方图柱可下钻到该区间 """
+        deviations = np.array([part[1] or 0.0 for part in part_deviations])
+        counts, edges = np.histogram(deviations, bins=self.LOD_BINS)
+
+        top_ax = figure.add_subplot(2, 1, 1)
+        hist_ax = figure.add_subplot(2, 1, 2)
+
+        def show_top(parts, title):
+            top = heapq.nlargest(self.LOD_TOP_N, parts, key=lambda part: part[1] or 0.0)
+            self.plot_part_bars(top_ax, top)
+            top_ax.tick_params(axis='x', labelrotation=45, labelsize=7)
+            top_ax.set_title(title, fontsize=12, fontweight='bold')
+
+        show_top(part_deviations, f'订单{order_name}偏差最大的{self.LOD_TOP_N}个零件(共{len(part_deviations)}个)')
+
+        hist_ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', color='#ff7f0e')
+        hist_ax.set_xlabel('交期偏差率(点击柱形查看该区间零件，点击空白处还原)', fontsize=10)
+        hist_ax.set_ylabel('零件数', fontsize=10)
+        hist_ax.grid(True, which='both', linestyle='--', linewidth=0.5)
+
+        def on_click(event):
+            if event.inaxes is not hist_ax or event.xdata is None:
+                return
+            bin_index = np.searchsorted(edges, event.xdata, side='right') - 1
+            if 0 <= bin_index < len(counts) and counts[bin_index]:
+                low, high = edges[bin_index], edges[bin_index + 1]
+                last_bin = bin_index == len(counts) - 1
+                parts = [part for part, deviation in zip(part_deviations, deviations)
+                         if low <= deviation < high or (last_bin and deviation == high)]
+                show_top(parts, f'偏差率 {low:.2f}~{high:.2f} 区间的零件(共{len(parts)}个)')
+            else:
+                show_top(part_deviations,
+                         f'订单{order_name}偏差最大的{self.LOD_TOP_N}个零件(共{len(part_deviations)}个)')
+            canvas.draw_idle()
+
+        canvas.mpl_connect('button_press_event', on_click)
+        figure.tight_layout()
+
 
 class Window(FramelessWindow):
 
@@ -622,6 +779,23 @@ class Window(FramelessWindow):
 
         self.db = Database()
 
+        # 内存诊断模式: 以 --memdiag 启动或设置环境变量 SUPPLY_PROGRESS_MEMDIAG=1
+        self.memoryDiagnostics = MemoryDiagnostics() if memory_diagnostics_enabled(sys.argv) else None
+        self.db.sweep_overdue_parts()
+
+        # 每小时检查一次是否跨天，跨天后增量扫描新逾期的零件
+        self.sweepTimer = QTimer(self)
+        self.sweepTimer.timeout.connect(self.sweepOverdueParts)
+        self.sweepTimer.start(60 * 60 * 1000)
+
+        # 定时在线备份，备份在后台线程分页进行，不阻塞界面和写入
+        self.backupManager = BackupManager(self.db.db_name)
+        self.backupTimer = QTimer(self)
+        self.backupTimer.timeout.connect(self.backupManager.start_backup)
+        self.backupTimer.start(BACKUP_INTERVAL * 1000)
+        if self.backupManager.is_backup_due(BACKUP_INTERVAL):
+            self.backupManager.start_backup()
+
         self.hBoxLayout = QHBoxLayout(self)
         self.navigationInterface = NavigationInterface(
             self, showMenuButton=True, showReturnButton=True)
@@ -629,8 +803,10 @@ class Window(FramelessWindow):
 
         # create sub interface
         self.overviewInterface = OverviewPage(self.db, self)
-        self.addOrderInterface = AddOrderInterface(self.db, self)
-        self.maintenanceInterface = MaintenanceInterface(self.db, self)
+        self.orderModel = OrderListModel(self.db, self)
+        self.addOrderInterface = AddOrderInterface(self.db, self.orderModel, self)
+        self.maintenanceInterface = MaintenanceInterface(self.db, self.orderModel, self)
+        self.timelineInterface = TimelinePage(self.db, self)
 
         # initialize layout
         self.initLayout()
@@ -657,6 +833,7 @@ class Window(FramelessWindow):
         self.addSubInterface(self.overviewInterface, FIF.HOME, '数据总览', NavigationItemPosition.SCROLL)
         self.addSubInterface(self.addOrderInterface, FIF.ADD, '新增订单', NavigationItemPosition.SCROLL)
         self.addSubInterface(self.maintenanceInterface, FIF.LABEL, '数据维护', NavigationItemPosition.SCROLL)
+        self.addSubInterface(self.timelineInterface, FIF.CALENDAR, '交期时间轴', NavigationItemPosition.SCROLL)
 
         self.navigationInterface.addSeparator()
 
@@ -725,11 +902,27 @@ class Window(FramelessWindow):
             self.setStyleSheet(f.read())
 
     def switchTo(self, widget):
+        if self.memoryDiagnostics is None:
+            self.showInterface(widget)
+            return
+        with self.memoryDiagnostics.measure(f'switchTo {widget.objectName()}'):
+            self.showInterface(widget)
+
+    def showInterface(self, widget):
         self.stackWidget.setCurrentWidget(widget)
-        if widget.objectName() == 'MaintenanceInterface':
+        if widget.objectName() in ('AddOrderInterface', 'MaintenanceInterface'):
             widget.update_order_names()
+        if widget.objectName() == 'AddOrderInterface':
+            widget.update_supplier_names()  # 维护界面中修改或删除零件后供应商列表可能变化
         if widget.objectName() == 'OverviewPage':
+            widget.overdue_panel.refresh()
             widget.plot_data()  # 切换到数据总览界面时刷新图表
+        if widget.objectName() == 'TimelinePage':
+            widget.reload()
+
+    def sweepOverdueParts(self):
+        if self.db.sweep_overdue_parts():
+            self.overviewInterface.overdue_panel.refresh()
 
     def onCurrentInterfaceChanged(self, index):
         widget = self.stackWidget.widget(index)
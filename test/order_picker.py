@@ -0,0 +1,156 @@
+# coding:utf-8
+import bisect
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QStringListModel, pyqtSignal
+from PyQt5.QtWidgets import QCompleter, QLineEdit
+
+from qfluentwidgets import LineEdit
+
+
+class OrderListModel(QAbstractListModel):
+    """ 各界面共享的订单列表，按数据库变更增量更新，并维护用于前缀/子串搜索的内存索引 """
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.orders = []  # [(order_id, order_name)]
+        self.order_ids = {}  # order_name -> order_id
+        self.sorted_names = []  # [(小写名称, 名称)]，用于前缀二分查找
+        self.generation = None
+        self.refresh()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.orders)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if index.isValid() and role in (Qt.DisplayRole, Qt.EditRole):
+            return self.orders[index.row()][1]
+        if index.isValid() and role == Qt.UserRole:
+            return self.orders[index.row()][0]
+        return None
+
+    def refresh(self):
+        """ orders 表没有写入时直接返回，否则只插入/删除/修改变化的行 """
+        generation = self.db.table_generations['orders']
+        if generation == self.generation:
+            return
+        self.generation = generation
+
+        order_names = self.db.fetch_order_names()
+        for row in reversed(range(len(self.orders))):
+            order_id, order_name = self.orders[row]
+            if order_id not in order_names:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self.orders[row]
+                self.endRemoveRows()
+                self.remove_from_index(order_id, order_name)
+            elif order_names[order_id] != order_name:
+                self.orders[row] = (order_id, order_names[order_id])
+                self.remove_from_index(order_id, order_name)
+                self.add_to_index(order_id, order_names[order_id])
+                self.dataChanged.emit(self.index(row), self.index(row))
+
+        known_ids = {order_id for order_id, _ in self.orders}
+        new_orders = [(order_id, name) for order_id, name in order_names.items() if order_id not in known_ids]
+        if new_orders:
+            self.beginInsertRows(QModelIndex(), len(self.orders), len(self.orders) + len(new_orders) - 1)
+            self.orders.extend(new_orders)
+            self.endInsertRows()
+            self.add_many_to_index(new_orders)
+
+    def add_to_index(self, order_id, order_name):
+        # 重名订单只索引第一个，与原先按名称查找的行为一致
+        if order_name in self.order_ids:
+            return
+        self.order_ids[order_name] = order_id
+        bisect.insort(self.sorted_names, (order_name.lower(), order_name))
+
+    def add_many_to_index(self, orders):
+        # 首次加载等批量插入时追加后整体排序一次，避免逐个 insort 的 O(n²)
+        added = False
+        for order_id, order_name in orders:
+            if order_name not in self.order_ids:
+                self.order_ids[order_name] = order_id
+                self.sorted_names.append((order_name.lower(), order_name))
+                added = True
+        if added:
+            self.sorted_names.sort()
+
+    def remove_from_index(self, order_id, order_name):
+        if self.order_ids.get(order_name) != order_id:
+            return
+        del self.order_ids[order_name]
+        for other_id, other_name in self.orders:
+            if other_name == order_name:
+                self.order_ids[order_name] = other_id
+                return
+        entry = (order_name.lower(), order_name)
+        position = bisect.bisect_left(self.sorted_names, entry)
+        if position < len(self.sorted_names) and self.sorted_names[position] == entry:
+            del self.sorted_names[position]
+
+    def order_id(self, order_name):
+        return self.order_ids.get(order_name)
+
+    def search(self, text, limit=50):
+        """ 前缀匹配的结果在前(二分查找)，其后是子串匹配的结果 """
+        key = text.lower()
+        if not key:
+            return [name for _, name in self.sorted_names[:limit]]
+
+        matches = []
+        position = bisect.bisect_left(self.sorted_names, (key, ''))
+        while position < len(self.sorted_names) and len(matches) < limit:
+            lower_name, name = self.sorted_names[position]
+            if not lower_name.startswith(key):
+                break
+            matches.append(name)
+            position += 1
+
+        for lower_name, name in self.sorted_names:
+            if len(matches) >= limit:
+                break
+            if key in lower_name and not lower_name.startswith(key):
+                matches.append(name)
+        return matches
+
+
+class OrderPicker(LineEdit):
+    """ 带输入联想的订单选择框，输入内容与某个订单名称完全一致时视为选中 """
+    orderChanged = pyqtSignal()
+
+    def __init__(self, order_model, parent=None):
+        super().__init__(parent)
+        self.order_model = order_model
+        self.selected_order_id = None
+        self.setPlaceholderText('输入订单名称搜索')
+        self.setClearButtonEnabled(True)
+
+        self.suggestion_model = QStringListModel(self)
+        self.order_completer = QCompleter(self.suggestion_model, self)
+        # 过滤由 OrderListModel.search 完成，补全器只负责显示
+        self.order_completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.order_completer.setMaxVisibleItems(12)
+        QLineEdit.setCompleter(self, self.order_completer)
+
+        self.textEdited.connect(self.update_suggestions)
+        self.textChanged.connect(self.update_selection)
+        self.order_completer.activated[str].connect(self.setText)
+
+    def update_suggestions(self, text):
+        self.suggestion_model.setStringList(self.order_model.search(text))
+        self.order_completer.complete()
+
+    def update_selection(self, text):
+        order_id = self.order_model.order_id(text)
+        if order_id != self.selected_order_id:
+            self.selected_order_id = order_id
+            self.orderChanged.emit()
+
+    def currentOrderId(self):
+        return self.selected_order_id
+
+    def refresh(self):
+        """ 订单列表变化后重新校验当前输入，已删除的订单会被取消选中 """
+        self.order_model.refresh()
+        self.update_selection(self.text())
@@ -0,0 +1,230 @@
+# coding:utf-8
+from PyQt5.QtCore import Qt, QRectF, QTimer, QDate
+from PyQt5.QtGui import QColor, QPen, QBrush, QPainter, QFont
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QGraphicsView, QGraphicsScene, \
+    QGraphicsItem, QStyleOptionGraphicsItem
+
+from database import day_to_date
+from qfluentwidgets import PushButton
+
+DAY_WIDTH = 4.0  # 缩放为 1 时每天的像素宽度
+ROW_HEIGHT = 14.0
+BAR_HEIGHT = 10.0
+
+ON_TIME_COLOR = QColor('#2ca02c')
+LATE_COLOR = QColor('#d62728')
+PENDING_COLOR = QColor('#ff7f0e')
+PLANNED_COLOR = QColor('#1f77b4')
+
+
+class PartBarItem(QGraphicsItem):
+    """ 单个零件的计划/实际交期条，按缩放级别决定绘制细节 """
+
+    def __init__(self, order_name, part_name, supplier, planned_day, actual_day, row):
+        super().__init__()
+        self.part_name = part_name
+        self.planned_day = planned_day
+        self.actual_day = actual_day
+        end_day = actual_day if actual_day is not None else planned_day
+        self.start_day = min(planned_day, end_day)
+        self.end_day = max(planned_day, end_day) + 1
+        if actual_day is None:
+            self.color = PENDING_COLOR
+        elif actual_day > planned_day:
+            self.color = LATE_COLOR
+        else:
+            self.color = ON_TIME_COLOR
+
+        self.rect = QRectF(0, 0, (self.end_day - self.start_day) * DAY_WIDTH, BAR_HEIGHT)
+        self.setPos(self.start_day * DAY_WIDTH, row * ROW_HEIGHT + (ROW_HEIGHT - BAR_HEIGHT) / 2)
+        self.setToolTip(f'订单{order_name} / {part_name} ({supplier})\n'
+                        f'计划交期 {day_to_date(planned_day)}\n实际交货 {day_to_date(actual_day) or "未交货"}')
+
+    def boundingRect(self):
+        return self.rect
+
+    def paint(self, painter, option, widget=None):
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+
+        # 缩得很小时只画一个色块
+        if lod < 0.5:
+            painter.fillRect(self.rect, self.color)
+            return
+
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QBrush(self.color.lighter(150)))
+        painter.drawRect(self.rect)
+
+        # 计划交期和实际交期标记
+        planned_x = (self.planned_day - self.start_day) * DAY_WIDTH
+        painter.fillRect(QRectF(planned_x, 0, DAY_WIDTH, BAR_HEIGHT), PLANNED_COLOR)
+        if self.actual_day is not None:
+            actual_x = (self.actual_day - self.start_day) * DAY_WIDTH
+            painter.fillRect(QRectF(actual_x, 0, DAY_WIDTH, BAR_HEIGHT), self.color)
+
+        # 放大到文字放得下时才画零件名称
+        if lod >= 2.0:
+            painter.setPen(QPen(Qt.black))
+            font = QFont()
+            font.setPixelSize(int(BAR_HEIGHT) - 2)
+            painter.setFont(font)
+            painter.drawText(self.rect.adjusted(DAY_WIDTH + 2, 0, 0, 0), Qt.AlignVCenter, self.part_name)
+
+
+class TimelineView(QGraphicsView):
+    """ 时间轴视图: 滚轮水平缩放，背景只绘制可见区域内的网格 """
+    MIN_SCALE = 0.05
+    MAX_SCALE = 20.0
+
+    def __init__(self, scene, parent=None):
+        super().__init__(scene, parent)
+        self.zoom = 1.0
+        self.setRenderHint(QPainter.Antialiasing, False)
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        self.setOptimizationFlags(QGraphicsView.DontSavePainterState | QGraphicsView.DontAdjustForAntialiasing)
+        self.setDragMode(QGraphicsView.ScrollHandDrag)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.setAlignment(Qt.AlignLeft | Qt.AlignTop)
+
+    def wheelEvent(self, e):
+        if e.modifiers() & Qt.ControlModifier:
+            super().wheelEvent(e)
+            return
+        factor = 1.25 if e.angleDelta().y() > 0 else 0.8
+        zoom = min(max(self.zoom * factor, self.MIN_SCALE), self.MAX_SCALE)
+        self.scale(zoom / self.zoom, 1.0)
+        self.zoom = zoom
+
+    def visible_day_range(self):
+        rect = self.mapToScene(self.viewport().rect()).boundingRect()
+        return int(rect.left() // DAY_WIDTH), int(rect.right() // DAY_WIDTH) + 1
+
+    def visible_row_range(self):
+        rect = self.mapToScene(self.viewport().rect()).boundingRect()
+        return int(rect.top() // ROW_HEIGHT), int(rect.bottom() // ROW_HEIGHT)
+
+    def drawBackground(self, painter, rect):
+        super().drawBackground(painter, rect)
+        # 缩放较大时按周画网格，否则按月
+        step = 7 if self.zoom >= 1.0 else 30
+        first_day = int(rect.left() // DAY_WIDTH) // step * step
+        last_day = int(rect.right() // DAY_WIDTH) + 1
+        painter.setPen(QPen(QColor(220, 220, 220), 0))
+        for day in range(first_day, last_day, step):
+            x = day * DAY_WIDTH
+            painter.drawLine(int(x), int(rect.top()), int(x), int(rect.bottom()))
+
+        today_x = QDate.currentDate().toJulianDay() * DAY_WIDTH
+        if rect.left() <= today_x <= rect.right():
+            painter.setPen(QPen(LATE_COLOR, 0, Qt.DashLine))
+            painter.drawLine(int(today_x), int(rect.top()), int(today_x), int(rect.bottom()))
+
+    def drawForeground(self, painter, rect):
+        # 顶部固定显示可见区间内的月份刻度
+        painter.save()
+        painter.resetTransform()
+        painter.setPen(QPen(Qt.darkGray))
+        start_day, end_day = self.visible_day_range()
+        date = QDate.fromJulianDay(start_day)
+        date = QDate(date.year(), date.month(), 1)
+        while date.toJulianDay() <= end_day:
+            x = self.mapFromScene(date.toJulianDay() * DAY_WIDTH, 0).x()
+            painter.drawText(x + 2, 12, date.toString('yyyy-MM'))
+            date = date.addMonths(1)
+        painter.restore()
+
+
+class TimelinePage(QWidget):
+    """ 计划交期与实际交期时间轴，只加载当前可见的行和时间窗口内的零件 """
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent=parent)
+        self.setObjectName('TimelinePage')
+        self.db = db
+        self.items = {}  # part_id -> PartBarItem
+        self.row_count = 0
+        self.loaded_range = None  # (起始天, 结束天, 起始行, 结束行)
+        self.initUI()
+
+    def initUI(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(10, 40, 10, 10)
+
+        toolbar = QHBoxLayout()
+        self.summary_label = QLabel(self)
+        toolbar.addWidget(self.summary_label, 1)
+        self.today_button = PushButton('回到今天')
+        self.today_button.clicked.connect(self.scroll_to_today)
+        toolbar.addWidget(self.today_button)
+        layout.addLayout(toolbar)
+
+        # 场景使用默认的 BSP 树索引，重绘和命中测试只访问可见区域内的条目
+        self.scene = QGraphicsScene(self)
+        self.scene.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+        self.view = TimelineView(self.scene, self)
+        layout.addWidget(self.view)
+
+        # 滚动和缩放停止后再按可见区间加载数据
+        self.load_timer = QTimer(self)
+        self.load_timer.setSingleShot(True)
+        self.load_timer.setInterval(100)
+        self.load_timer.timeout.connect(self.load_visible_range)
+        self.view.horizontalScrollBar().valueChanged.connect(self.load_timer.start)
+        self.view.horizontalScrollBar().rangeChanged.connect(self.load_timer.start)
+        self.view.verticalScrollBar().valueChanged.connect(self.load_timer.start)
+
+        self.reload()
+
+    def reload(self):
+        """ 数据变更后重建场景范围，再加载可见区间 """
+        self.scene.clear()
+        self.items.clear()
+        self.loaded_range = None
+        _, _, self.row_count = self.db.fetch_part_row_offsets()
+
+        first_day, last_day = self.db.fetch_part_day_bounds()
+        if first_day is None:
+            self.summary_label.setText('暂无零件数据')
+            return
+        self.summary_label.setText(f'共 {self.row_count} 个零件，{day_to_date(first_day)} ~ {day_to_date(last_day)}'
+                                   f'，滚轮缩放，拖动平移')
+        self.scene.setSceneRect((first_day - 30) * DAY_WIDTH, 0, (last_day - first_day + 60) * DAY_WIDTH,
+                                max(self.row_count, 1) * ROW_HEIGHT)
+        self.load_timer.start()
+
+    def scroll_to_today(self):
+        self.view.centerOn(QDate.currentDate().toJulianDay() * DAY_WIDTH, self.view.mapToScene(
+            self.view.viewport().rect().center()).y())
+
+    def load_visible_range(self):
+        start_day, end_day = self.view.visible_day_range()
+        first_row, last_row = self.view.visible_row_range()
+        if self.loaded_range and self.loaded_range[0] <= start_day and end_day <= self.loaded_range[1] \
+                and self.loaded_range[2] <= first_row and last_row <= self.loaded_range[3]:
+            return
+
+        # 水平和垂直方向各多加载一屏，来回小幅平移时不必重复查询
+        span = end_day - start_day
+        start_day, end_day = start_day - span, end_day + span
+        rows = last_row - first_row
+        first_row, last_row = first_row - rows, last_row + rows
+        self.loaded_range = (start_day, end_day, first_row, last_row)
+
+        # 按行取数，条目数只与窗口高度有关，缩到最小时也不会把所有零件放进场景
+        visible = set()
+        for row, order_name, part_id, part_name, supplier, planned_day, actual_day in self.db.fetch_parts_in_rows(
+                first_row, last_row):
+            last_day = max(planned_day, actual_day if actual_day is not None else planned_day)
+            first_day = min(planned_day, actual_day if actual_day is not None else planned_day)
+            if last_day < start_day or first_day > end_day:
+                continue
+            visible.add(part_id)
+            if part_id not in self.items:
+                item = PartBarItem(order_name, part_name, supplier, planned_day, actual_day, row)
+                self.scene.addItem(item)
+                self.items[part_id] = item
+
+        # 移出窗口的条目从场景中删除，场景中的条目数只与窗口大小有关
+        for part_id in list(self.items):
+            if part_id not in visible:
+                self.scene.removeItem(self.items.pop(part_id))